@@ -12,8 +12,19 @@ from pathlib import Path
 project_dir = Path(__file__).parent
 sys.path.insert(0, str(project_dir))
 
-# Now import the actual provider
-from src.dspy_promptfoo.provider import call_api
+# The provider (and DSPy) is imported on first call, so importing this
+# wrapper for introspection doesn't pay DSPy's startup cost
+def call_api(*args, **kwargs):
+    from src.dspy_promptfoo.provider import call_api as _impl
+    globals()['call_api'] = _impl
+    return _impl(*args, **kwargs)
 
-# Re-export the call_api function
-__all__ = ['call_api']
+
+def call_api_batch(*args, **kwargs):
+    from src.dspy_promptfoo.provider import call_api_batch as _impl
+    globals()['call_api_batch'] = _impl
+    return _impl(*args, **kwargs)
+
+
+# Re-export the provider entry points
+__all__ = ['call_api', 'call_api_batch']
@@ -0,0 +1,23 @@
+"""
+Environment loading helpers shared by the provider and auth modules
+"""
+import os
+from dotenv import load_dotenv
+
+# Marker set once the .env file has been parsed; inherited by child processes
+ENV_LOADED_MARKER = "DSPY_PROMPTFOO_ENV_LOADED"
+
+_loaded = False
+
+
+def load_env_once():
+    """Load the .env file at most once per process tree"""
+    global _loaded
+    
+    if _loaded or os.environ.get(ENV_LOADED_MARKER):
+        _loaded = True
+        return
+    
+    load_dotenv()
+    os.environ[ENV_LOADED_MARKER] = "1"
+    _loaded = True
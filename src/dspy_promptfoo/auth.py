@@ -2,35 +2,203 @@
 Authentication module for Cake's Promptfoo integration
 """
 import os
+import json
+import logging
+import time
+import base64
+import threading
 from typing import Optional, Dict, Any
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from cake_auth import CakeAuthClient, CakeAuthConfig
-from dotenv import load_dotenv
+from ._env import load_env_once
 import urllib.parse
 
-load_dotenv()
+load_env_once()
+
+
+class _DedupeFilter(logging.Filter):
+    """Drop log records identical to one already emitted"""
+    
+    def __init__(self):
+        super().__init__()
+        self._seen = set()
+        self._lock = threading.Lock()
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        key = (record.levelno, record.getMessage())
+        with self._lock:
+            if key in self._seen:
+                return False
+            self._seen.add(key)
+            return True
+
+
+_LOGGER_LOCK = threading.Lock()
+
+
+def _get_logger() -> logging.Logger:
+    """Return the auth logger, attaching its handler and dedupe filter once"""
+    logger = logging.getLogger("dspy_promptfoo.auth")
+    with _LOGGER_LOCK:
+        if not any(isinstance(f, _DedupeFilter) for f in logger.filters):
+            logger.addFilter(_DedupeFilter())
+            handler = logging.StreamHandler()
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            logger.addHandler(handler)
+            logger.setLevel(logging.INFO)
+            # Our handler already prints these; don't repeat via the root logger
+            logger.propagate = False
+    return logger
+
+
+log = _get_logger()
+
+# Refresh cached tokens once this fraction of their lifetime has elapsed
+TOKEN_REFRESH_FRACTION = 0.8
+# Never reuse a token closer than this many seconds to its expiry
+TOKEN_EXPIRY_SKEW = 60
+# Seconds to wait before retrying a failed Cake auth initialization
+AUTH_INIT_RETRY_INTERVAL = 60
+
+_quote = urllib.parse.quote
+
+# Keep-alive HTTPS pool shared by every PromptfooAuth in the process
+_HTTP_SESSION = None
+_HTTP_SESSION_LOCK = threading.Lock()
+
+
+def _decode_jwt_exp(token: str) -> Optional[float]:
+    """Read the exp claim from a JWT without verifying its signature"""
+    try:
+        payload = token.split('.')[1]
+        payload += '=' * (-len(payload) % 4)
+        claims = json.loads(base64.urlsafe_b64decode(payload))
+        return float(claims['exp'])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+def _get_http_session() -> requests.Session:
+    """Return the shared pooled HTTPS session, creating it on first use"""
+    global _HTTP_SESSION
+    
+    if _HTTP_SESSION is None:
+        with _HTTP_SESSION_LOCK:
+            if _HTTP_SESSION is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=10,
+                    pool_maxsize=20,
+                    max_retries=Retry(total=2, backoff_factor=0.2)
+                )
+                session.mount('https://', adapter)
+                _HTTP_SESSION = session
+    return _HTTP_SESSION
+
 
 class PromptfooAuth:
     """Handle authentication for Promptfoo using Cake's auth system"""
     
+    # Cake auth state shared by every instance in the process, so the
+    # config (and any Secrets Manager lookup) and token cache are built once
+    _shared_config = None
+    _shared_client = None
+    _shared_error: Optional[Exception] = None
+    _shared_retry_at = 0.0
+    _shared_token_cache = {"token": None, "exp": 0.0, "refresh_at": 0.0}
+    _shared_token_lock = threading.Lock()
+    _init_lock = threading.Lock()
+    
     def __init__(self):
         self.base_url = os.getenv('PROMPTFOO_REMOTE_API_BASE_URL', 'https://promptfoo.dev.aws.kflow.ai')
         self.app_url = os.getenv('PROMPTFOO_REMOTE_APP_BASE_URL', 'https://promptfoo.dev.aws.kflow.ai')
+        self.cluster_base = os.getenv('CLUSTER_BASE_NAME', 'dev.aws.kflow.ai')
+        # Cake OAuth URL prefixes; per-call work is just appending the argument
+        self._oauth_callback_base = f"https://oauth.{self.cluster_base}/callback?service="
+        self._oauth_auth_base = f"https://oauth.{self.cluster_base}/auth?rd="
         
-        try:
-            # Initialize Cake auth from environment
-            self.config = CakeAuthConfig.from_env()
-            self.client = CakeAuthClient(self.config)
-            self.auth_available = True
-        except Exception as e:
-            print(f"⚠️  Could not initialize Cake auth: {e}")
-            self.auth_available = False
-            self.config = None
-            self.client = None
+        self._init_shared_auth()
+        if self._shared_error is not None:
+            log.warning("⚠️  Could not initialize Cake auth: %s", self._shared_error)
+        self.config = self._shared_config
+        self.client = self._shared_client
+        self.auth_available = self.client is not None
+        
+        # In-process bearer token cache, refreshed ahead of expiry
+        self._token_cache = self._shared_token_cache
+        self._token_lock = self._shared_token_lock
+        
+    @classmethod
+    def _init_shared_auth(cls):
+        """
+        Initialize the process-wide Cake auth config and client once
         
+        A failed initialization is remembered, so instances created soon
+        after don't repeat the Secrets Manager lookup. It is retried at most
+        every AUTH_INIT_RETRY_INTERVAL seconds, so credentials supplied later
+        in the process are still picked up.
+        """
+        if cls._shared_client is not None or time.time() < cls._shared_retry_at:
+            return
+        with cls._init_lock:
+            if cls._shared_client is not None or time.time() < cls._shared_retry_at:
+                return
+            try:
+                # Initialize Cake auth from environment
+                config = CakeAuthConfig.from_env()
+                client = CakeAuthClient(config)
+                cls._share_http_session(client, _get_http_session())
+                cls._shared_config = config
+                cls._shared_client = client
+                cls._shared_error = None
+            except Exception as e:
+                cls._shared_error = e
+                cls._shared_retry_at = time.time() + AUTH_INIT_RETRY_INTERVAL
+        
+    @staticmethod
+    def _share_http_session(client: CakeAuthClient, session: requests.Session):
+        """Point the Cake auth client at the shared keep-alive session"""
+        # CakeAuthClient takes no transport argument, so swap in our pool only
+        # where it already keeps a requests.Session; other session types
+        # (e.g. a boto3 Session for Secrets Manager) are left untouched
+        replaced = False
+        for attr in ('session', '_session'):
+            if isinstance(getattr(client, attr, None), requests.Session):
+                setattr(client, attr, session)
+                replaced = True
+        if replaced:
+            log.debug("Replaced CakeAuthClient's HTTP session with the shared pool")
+        else:
+            log.debug("CakeAuthClient has no requests.Session; shared HTTPS pool not in use")
+        
+    def _cached_token(self) -> Optional[str]:
+        """Return the cached auth token, fetching a new one near expiry"""
+        with self._token_lock:
+            now = time.time()
+            cache = self._token_cache
+            if cache["token"] and now < cache["refresh_at"]:
+                return cache["token"]
+            
+            token = self.client.get_token()
+            exp = _decode_jwt_exp(token) if token else None
+            if exp is None:
+                # Unknown lifetime: don't cache, fetch again next time
+                cache.update(token=None, exp=0.0, refresh_at=0.0)
+            else:
+                refresh_at = now + (exp - now) * TOKEN_REFRESH_FRACTION
+                cache.update(
+                    token=token,
+                    exp=exp,
+                    refresh_at=min(refresh_at, exp - TOKEN_EXPIRY_SKEW)
+                )
+            return token
+    
     def get_auth_headers(self) -> Dict[str, str]:
         """Get authentication headers for Promptfoo API calls"""
         # Get the auth token from Cake's auth system
-        token = self.client.get_token()
+        token = self._cached_token()
         
         return {
             'Authorization': f'Bearer {token}',
@@ -40,44 +208,41 @@ class PromptfooAuth:
     def get_auth_callback_url(self, service_name: str = "promptfoo") -> str:
         """Get the OAuth callback URL for the service"""
         # Cake uses a specific pattern for OAuth callbacks
-        cluster_base = os.getenv('CLUSTER_BASE_NAME', 'dev.aws.kflow.ai')
-        return f"https://oauth.{cluster_base}/callback?service={service_name}"
+        return f"{self._oauth_callback_base}{service_name}"
     
     def get_authenticated_url(self, target_url: str) -> str:
         """Build authenticated redirect URL using Cake's OAuth pattern"""
         # Cake's OAuth flow expects: /auth?rd=<encoded_target_url>
-        cluster_base = os.getenv('CLUSTER_BASE_NAME', 'dev.aws.kflow.ai')
-        encoded_target = urllib.parse.quote(target_url, safe='')
-        return f"https://oauth.{cluster_base}/auth?rd={encoded_target}"
+        return self._oauth_auth_base + _quote(target_url, safe='')
     
     def configure_promptfoo_env(self):
         """Configure environment variables for Promptfoo with authentication"""
         # Check for manual JWT token first
         manual_token = os.getenv('CAKE_JWT_TOKEN')
         if manual_token:
-            print("🔑 Using manual JWT token")
+            log.info("🔑 Using manual JWT token")
             os.environ['PROMPTFOO_AUTH_TOKEN'] = manual_token
             os.environ['PROMPTFOO_SHARE_API_BASE_URL'] = self.base_url
             os.environ['PROMPTFOO_SHARE_APP_BASE_URL'] = self.app_url
             os.environ['PROMPTFOO_API_HEADERS'] = f'Authorization: Bearer {manual_token}'
-            print(f"✓ Authentication configured for {self.base_url}")
+            log.info("✓ Authentication configured for %s", self.base_url)
             return True
             
         if not self.auth_available:
-            print("⚠️  Cake auth not available - running without authentication")
-            print("To enable auth, you can:")
-            print("  1. Set CAKE_JWT_TOKEN with a manual token")
-            print("  2. Set CAKE_DEX_INFERENCE_PASSWORD")
-            print("  3. Or configure AWS credentials for Secrets Manager")
+            log.warning("⚠️  Cake auth not available - running without authentication")
+            log.info("To enable auth, you can:")
+            log.info("  1. Set CAKE_JWT_TOKEN with a manual token")
+            log.info("  2. Set CAKE_DEX_INFERENCE_PASSWORD")
+            log.info("  3. Or configure AWS credentials for Secrets Manager")
             return
             
         try:
             # Check which auth method is available
             auth_method = self.config.get_recommended_auth_method()
-            print(f"Using auth method: {auth_method}")
+            log.info("Using auth method: %s", auth_method)
             
             # Get auth token
-            token = self.client.get_token()
+            token = self._cached_token()
             
             if token:
                 # Set the auth token for Promptfoo
@@ -90,20 +255,20 @@ class PromptfooAuth:
                 # Also set headers for the API calls
                 os.environ['PROMPTFOO_API_HEADERS'] = f'Authorization: Bearer {token}'
                 
-                print(f"✓ Authentication configured for {self.base_url}")
+                log.info("✓ Authentication configured for %s", self.base_url)
                 return True
             else:
-                print("⚠️  No auth token retrieved - authentication may fail")
+                log.warning("⚠️  No auth token retrieved - authentication may fail")
                 return False
                 
         except Exception as e:
-            print(f"⚠️  Authentication setup failed: {e}")
+            log.warning("⚠️  Authentication setup failed: %s", e)
             
             # If it's a browser flow error, suggest the browser auth
             if "browser" in str(e).lower():
-                print("\nTry browser authentication:")
-                print(f"  1. Run: python -m cake_auth login")
-                print(f"  2. Complete authentication in browser")
-                print(f"  3. Retry the evaluation")
+                log.info("\nTry browser authentication:")
+                log.info("  1. Run: python -m cake_auth login")
+                log.info("  2. Complete authentication in browser")
+                log.info("  3. Retry the evaluation")
             
             return False
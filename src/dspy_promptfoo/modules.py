@@ -4,7 +4,7 @@ Demonstrates various DSPy capabilities including signatures, optimization, and d
 """
 
 import dspy
-from typing import List, Dict, Any
+from typing import List, Dict, Any, FrozenSet
 
 
 # Simple Q&A Module
@@ -55,11 +55,25 @@ class MultiHopQA(dspy.Module):
 class TextClassifier(dspy.Module):
     """Text classification module"""
     
+    # Parsed signatures keyed by category set, shared across instances
+    _SIGNATURE_CACHE: Dict[FrozenSet[str], type] = {}
+    
     def __init__(self, categories: List[str]):
         super().__init__()
         self.categories = categories
-        categories_str = ", ".join(categories)
-        self.classify = dspy.Predict(f"text -> category: Literal[{categories_str}]")
+        self.classify = dspy.Predict(self._signature_for(categories))
+    
+    @classmethod
+    def _signature_for(cls, categories: List[str]) -> type:
+        """Parse the classification signature once per set of categories"""
+        key = frozenset(categories)
+        signature = cls._SIGNATURE_CACHE.get(key)
+        if signature is None:
+            # Sorting makes the Literal identical for any category order
+            categories_str = ", ".join(sorted(key))
+            signature = dspy.Signature(f"text -> category: Literal[{categories_str}]")
+            cls._SIGNATURE_CACHE[key] = signature
+        return signature
     
     def forward(self, text):
         return self.classify(text=text)
@@ -130,62 +144,61 @@ class RAGModule(dspy.Module):
         return self.generate_answer(context=context, question=question)
 
 
-# Example training data for optimization
-def get_example_trainset():
-    """Get example training data for DSPy optimization"""
+# Example training data for optimization, built once at import
+_QA_EXAMPLES = (
+    dspy.Example(
+        question="What is the capital of France?",
+        answer="Paris"
+    ).with_inputs("question"),
     
-    # Q&A examples
-    qa_examples = [
-        dspy.Example(
-            question="What is the capital of France?",
-            answer="Paris"
-        ).with_inputs("question"),
-        
-        dspy.Example(
-            question="Who wrote Romeo and Juliet?",
-            answer="William Shakespeare"
-        ).with_inputs("question"),
-        
-        dspy.Example(
-            question="What is the speed of light?",
-            answer="299,792,458 meters per second"
-        ).with_inputs("question"),
-    ]
-    
-    # Classification examples
-    classification_examples = [
-        dspy.Example(
-            text="I love this product! Best purchase ever.",
-            category="positive"
-        ).with_inputs("text"),
-        
-        dspy.Example(
-            text="This is terrible. Complete waste of money.",
-            category="negative"
-        ).with_inputs("text"),
-        
-        dspy.Example(
-            text="It's okay, nothing special.",
-            category="neutral"
-        ).with_inputs("text"),
-    ]
-    
-    # Code generation examples
-    code_examples = [
-        dspy.Example(
-            description="Write a Python function to calculate factorial",
-            code="""def factorial(n):
+    dspy.Example(
+        question="Who wrote Romeo and Juliet?",
+        answer="William Shakespeare"
+    ).with_inputs("question"),
+    
+    dspy.Example(
+        question="What is the speed of light?",
+        answer="299,792,458 meters per second"
+    ).with_inputs("question"),
+)
+
+_CLASSIFICATION_EXAMPLES = (
+    dspy.Example(
+        text="I love this product! Best purchase ever.",
+        category="positive"
+    ).with_inputs("text"),
+    
+    dspy.Example(
+        text="This is terrible. Complete waste of money.",
+        category="negative"
+    ).with_inputs("text"),
+    
+    dspy.Example(
+        text="It's okay, nothing special.",
+        category="neutral"
+    ).with_inputs("text"),
+)
+
+_CODE_EXAMPLES = (
+    dspy.Example(
+        description="Write a Python function to calculate factorial",
+        code="""def factorial(n):
     if n == 0 or n == 1:
         return 1
     return n * factorial(n - 1)""",
-            explanation="This recursive function calculates the factorial of a number."
-        ).with_inputs("description"),
-    ]
-    
+        explanation="This recursive function calculates the factorial of a number."
+    ).with_inputs("description"),
+)
+
+
+def get_example_trainset():
+    """Get example training data for DSPy optimization"""
+    # Fresh lists so callers can add or drop examples without
+    # affecting the shared module-level sets
     return {
-        "qa": qa_examples,
-        "classification": classification_examples,
-        "code": code_examples
+        "qa": list(_QA_EXAMPLES),
+        "classification": list(_CLASSIFICATION_EXAMPLES),
+        "code": list(_CODE_EXAMPLES)
     }
 
 
@@ -5,18 +5,110 @@ This provider integrates DSPy's programmatic prompt optimization with Promptfoo'
 
 import os
 import json
+import asyncio
+import time
+import random
+import operator
+import inspect
+import functools
+import contextvars
+import threading
+import concurrent.futures
 import dspy
-from typing import Dict, Any, Optional, List
+from dspy.teleprompt import BootstrapFewShot, BootstrapFewShotWithRandomSearch
+from openai import RateLimitError, APIConnectionError, APIStatusError
+from typing import Dict, Any, Optional, List, Callable, Tuple, Union
 from datetime import datetime
-from dotenv import load_dotenv
+if __package__:
+    from ._env import load_env_once
+else:
+    # Run as a plain script (python src/dspy_promptfoo/provider.py)
+    from _env import load_env_once
+
+# Prefer orjson for serializing results when it is installed
+try:
+    import orjson
+    
+    def _dumps(obj: Any, pretty: bool = False) -> str:
+        # OPT_NON_STR_KEYS matches json's handling of int/float/bool keys
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+        return orjson.dumps(obj, default=str, option=option).decode()
+except ImportError:
+    def _dumps(obj: Any, pretty: bool = False) -> str:
+        return json.dumps(obj, default=str, indent=2 if pretty else None)
 
 # Load environment variables
-load_dotenv()
+load_env_once()
+
+# Process-wide provider shared across call_api invocations
+_PROVIDER_SINGLETON = None
+_PROVIDER_LOCK = threading.Lock()
+
+# Module constructors keyed by config module_type (ReAct is built separately)
+_MODULE_FACTORIES: Dict[str, Callable[[str], dspy.Module]] = {
+    "predict": dspy.Predict,
+    "chain_of_thought": dspy.ChainOfThought,
+    "program_of_thought": dspy.ProgramOfThought,
+}
+
+# Last whole second seen by _now_iso() and its formatted timestamp
+_LAST_TS = [0, ""]
+
+# Token counters read from each per-model DSPy usage entry
+_USAGE_COUNTS = operator.itemgetter("total_tokens", "prompt_tokens", "completion_tokens")
+
+# Cooldown after an LM 429: calls before this time fail fast instead of
+# adding to the backend's load
+_RATE_LIMIT_UNTIL = 0.0
+_RATE_LIMIT_LOCK = threading.Lock()
+# Retries per LM call for 429s and transient connection/5xx errors; this is
+# the only retry policy, as litellm's own retries are disabled
+_LM_RETRIES = 3
+_MAX_BACKOFF = 60.0
+
+# Promptfoo template syntax; prompts containing it are driven by vars alone
+_TEMPLATE_MARKER = "{{"
+
+# Module config used when promptfooconfig.yaml doesn't override it
+_DEFAULT_MODULE_TYPE = "predict"
+_DEFAULT_SIGNATURE = "question -> answer"
+
+# Input fields assumed for examples that don't list their own
+_DEFAULT_EXAMPLE_INPUTS = ("question",)
+
+
+def _tool_workers() -> int:
+    """Size of the ReAct tool pool from DSPY_TOOL_WORKERS, defaulting to 16"""
+    try:
+        workers = int(os.getenv("DSPY_TOOL_WORKERS", "16"))
+    except ValueError:
+        return 16
+    return workers if workers > 0 else 16
+
+
+def _now_iso() -> str:
+    """Current local time as ISO 8601, formatted at most once per second"""
+    t = int(time.time())
+    if t != _LAST_TS[0]:
+        _LAST_TS[1] = datetime.fromtimestamp(t).isoformat()
+        _LAST_TS[0] = t
+    return _LAST_TS[1]
+
+
+def _answer_metric(gold, pred, trace=None):
+    """Default optimization metric: check if the gold answer is present"""
+    if hasattr(pred, "answer") and hasattr(gold, "answer"):
+        return gold.answer.lower() in pred.answer.lower()
+    return True
 
 
 class DSPyProvider:
     """Custom Promptfoo provider that wraps DSPy modules"""
     
+    # DSPy settings are global, so only configure them once per process
+    _dspy_configured = False
+    _configure_lock = threading.Lock()
+    
     def __init__(self):
         # Configure DSPy with OpenAI
         api_key = os.environ.get("OPENAI_API_KEY")
@@ -24,31 +116,117 @@ class DSPyProvider:
             raise ValueError("OPENAI_API_KEY environment variable is required")
         
         # Initialize DSPy with OpenAI
-        self.lm = dspy.LM("openai/gpt-4o-mini", api_key=api_key)
-        dspy.settings.configure(lm=self.lm, track_usage=True)
+        # Retries (429s, connection errors, timeouts, 5xx) are handled by
+        # _call_with_backoff; disable litellm's so each attempt is one request
+        self.lm = dspy.LM("openai/gpt-4o-mini", api_key=api_key, num_retries=0)
+        with DSPyProvider._configure_lock:
+            if not DSPyProvider._dspy_configured:
+                dspy.settings.configure(lm=self.lm, track_usage=True)
+                DSPyProvider._dspy_configured = True
+        
+        # Cache for compiled modules, shared by concurrent promptfoo workers
+        self.compiled_modules: Dict[Tuple, dspy.Module] = {}
+        self._modules_lock = threading.Lock()
+        self._build_locks: Dict[Tuple, threading.Lock] = {}
+        
+        # Cached attribute getters for output fields
+        self._attrgetters: Dict[str, operator.attrgetter] = {}
+        
+        # Prebuilt module for the default, unoptimized configuration
+        self._default_predict = dspy.Predict(_DEFAULT_SIGNATURE)
+        
+        # Bounded pool that runs ReAct tool functions; reused across requests
+        # so tool calls don't spin up threads per evaluation
+        self._tool_pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=_tool_workers(),
+            thread_name_prefix="dspy-tool"
+        )
+        
+        # Background event loop for batched async LM calls, started lazily
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_lock = threading.Lock()
+    
+    def _run_async(self, coro):
+        """Run a coroutine on the provider's shared event loop and wait for it"""
+        # A single long-lived loop lets the LM client's async connection pool
+        # be reused across batches instead of being rebuilt per asyncio.run()
+        with self._loop_lock:
+            if self._loop is None:
+                # The loop keeps its own default executor, so DNS lookups for
+                # LM connections don't queue behind tool work
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=self._loop.run_forever,
+                    name="dspy-promptfoo-loop",
+                    daemon=True
+                ).start()
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+    
+    def _pooled_tool(self, tool: Any) -> Any:
+        """Wrap a plain tool function so each call runs on the shared tool pool"""
+        # Leave async tools, dspy.Tool instances and other callables as-is
+        if inspect.iscoroutinefunction(tool) or not (
+                inspect.isfunction(tool) or inspect.ismethod(tool)):
+            return tool
         
-        # Cache for compiled modules
-        self.compiled_modules = {}
+        # functools.wraps keeps the name, docstring and signature that
+        # ReAct uses to describe the tool to the LM
+        @functools.wraps(tool)
+        def run_on_pool(*args, **kwargs):
+            # Carry contextvars over so dspy.context overrides, usage tracking
+            # and traces still apply inside the tool
+            ctx = contextvars.copy_context()
+            future = self._tool_pool.submit(ctx.run, tool, *args, **kwargs)
+            try:
+                on_batch_loop = asyncio.get_running_loop() is self._loop
+            except RuntimeError:
+                on_batch_loop = False
+            if on_batch_loop:
+                # Tool.acall awaits coroutine results, so the batch loop keeps
+                # running other rows while this tool works on the pool
+                return _await_future(future)
+            return future.result()
+        return run_on_pool
     
     def _get_or_create_module(self, config: Dict[str, Any]) -> dspy.Module:
         """Get or create a DSPy module based on configuration"""
-        module_type = config.get("module_type", "predict")
-        signature = config.get("signature", "question -> answer")
+        module_type = config.get("module_type", _DEFAULT_MODULE_TYPE)
+        signature = config.get("signature", _DEFAULT_SIGNATURE)
         
-        # Create unique key for caching
-        cache_key = f"{module_type}_{signature}"
+        # Fast path: the default shape needs no cache key or lock
+        if (module_type == _DEFAULT_MODULE_TYPE and signature == _DEFAULT_SIGNATURE
+                and not config.get("optimize", False)):
+            return self._default_predict
         
-        if cache_key in self.compiled_modules:
-            return self.compiled_modules[cache_key]
+        # Create unique key for caching; every config field that changes the
+        # built module must be part of it
+        cache_key = (
+            module_type,
+            signature,
+            bool(config.get("optimize", False)),
+            config.get("optimizer", "BootstrapFewShot"),
+            json.dumps(config.get("examples", []), sort_keys=True),
+        )
         
+        module = self.compiled_modules.get(cache_key)
+        if module is not None:
+            return module
+        
+        # Builds (and optimizer runs) are serialized per config only, so
+        # callers of other configs aren't blocked behind a long compile
+        with self._modules_lock:
+            build_lock = self._build_locks.setdefault(cache_key, threading.Lock())
+        with build_lock:
+            module = self.compiled_modules.get(cache_key)
+            if module is None:
+                module = self._build_module(module_type, signature, config)
+                self.compiled_modules[cache_key] = module
+        return module
+    
+    def _build_module(self, module_type: str, signature: str, config: Dict[str, Any]) -> dspy.Module:
+        """Construct (and optionally optimize) a DSPy module"""
         # Create the appropriate DSPy module
-        if module_type == "predict":
-            module = dspy.Predict(signature)
-        elif module_type == "chain_of_thought":
-            module = dspy.ChainOfThought(signature)
-        elif module_type == "program_of_thought":
-            module = dspy.ProgramOfThought(signature)
-        elif module_type == "react":
+        if module_type == "react":
             # ReAct requires tools
             tools = config.get("tools", [])
             if not tools:
@@ -56,16 +234,16 @@ class DSPyProvider:
                 def dummy_tool(x: str) -> str:
                     return f"Processed: {x}"
                 tools = [dummy_tool]
-            module = dspy.ReAct(signature, tools=tools)
+            module = dspy.ReAct(signature, tools=[self._pooled_tool(t) for t in tools])
         else:
-            # Default to Predict
-            module = dspy.Predict(signature)
+            # Unknown module types default to Predict
+            factory = _MODULE_FACTORIES.get(module_type, dspy.Predict)
+            module = factory(signature)
         
         # Apply optimization if requested
         if config.get("optimize", False):
             module = self._optimize_module(module, config)
         
-        self.compiled_modules[cache_key] = module
         return module
     
     def _optimize_module(self, module: dspy.Module, config: Dict[str, Any]) -> dspy.Module:
@@ -78,26 +256,17 @@ class DSPyProvider:
             return module
         
         # Convert examples to DSPy format
-        trainset = []
-        for ex in examples:
-            dspy_ex = dspy.Example(**ex).with_inputs(*ex.get("inputs", ["question"]))
-            trainset.append(dspy_ex)
-        
-        # Create metric function
-        def metric(gold, pred, trace=None):
-            # Simple metric: check if answer is present
-            if hasattr(pred, "answer") and hasattr(gold, "answer"):
-                return gold.answer.lower() in pred.answer.lower()
-            return True
+        trainset = [
+            dspy.Example(**ex).with_inputs(*ex.get("inputs", _DEFAULT_EXAMPLE_INPUTS))
+            for ex in examples
+        ]
         
         # Apply optimizer
         if optimizer_type == "BootstrapFewShot":
-            from dspy.teleprompt import BootstrapFewShot
-            optimizer = BootstrapFewShot(metric=metric)
+            optimizer = BootstrapFewShot(metric=_answer_metric)
             compiled = optimizer.compile(module, trainset=trainset)
         elif optimizer_type == "BootstrapFewShotWithRandomSearch":
-            from dspy.teleprompt import BootstrapFewShotWithRandomSearch
-            optimizer = BootstrapFewShotWithRandomSearch(metric=metric, num_candidate_programs=3)
+            optimizer = BootstrapFewShotWithRandomSearch(metric=_answer_metric, num_candidate_programs=3)
             compiled = optimizer.compile(module, trainset=trainset)
         else:
             # Default: return unoptimized
@@ -109,14 +278,20 @@ class DSPyProvider:
         """Extract output from DSPy result based on configuration"""
         output_field = config.get("output_field", "answer")
         
-        # Handle different result types
-        if hasattr(result, output_field):
-            return str(getattr(result, output_field))
-        elif isinstance(result, dict) and output_field in result:
+        # Common case: a Prediction carrying the requested field
+        getter = self._attrgetters.get(output_field)
+        if getter is None:
+            getter = self._attrgetters.setdefault(output_field, operator.attrgetter(output_field))
+        try:
+            return str(getter(result))
+        except AttributeError:
+            pass
+        
+        # Handle other result types
+        if isinstance(result, dict) and output_field in result:
             return str(result[output_field])
-        else:
-            # Try to convert to string
-            return str(result)
+        # Try to convert to string
+        return str(result)
     
     def _get_usage_stats(self, result: Any) -> Dict[str, Any]:
         """Extract usage statistics from DSPy result"""
@@ -126,27 +301,198 @@ class DSPyProvider:
         if hasattr(result, "get_lm_usage"):
             lm_usage = result.get_lm_usage()
             if lm_usage:
-                total_tokens = 0
-                prompt_tokens = 0
-                completion_tokens = 0
+                total_tokens = prompt_tokens = completion_tokens = 0
                 
-                for entry in lm_usage:
-                    if isinstance(entry, dict):
-                        usage_data = entry.get("usage", {})
-                        total_tokens += usage_data.get("total_tokens", 0)
-                        prompt_tokens += usage_data.get("prompt_tokens", 0)
-                        completion_tokens += usage_data.get("completion_tokens", 0)
+                # DSPy reports usage as {model_name: usage_dict}
+                for entry in lm_usage.values():
+                    try:
+                        total, prompt, completion = _USAGE_COUNTS(entry)
+                        total_tokens, prompt_tokens, completion_tokens = (
+                            total_tokens + total,
+                            prompt_tokens + prompt,
+                            completion_tokens + completion
+                        )
+                    except (KeyError, TypeError):
+                        continue
                 
-                if total_tokens > 0:
-                    usage = {
-                        "total": total_tokens,
-                        "prompt": prompt_tokens,
-                        "completion": completion_tokens
-                    }
+                usage = {
+                    "total": total_tokens,
+                    "prompt": prompt_tokens,
+                    "completion": completion_tokens
+                }
         
         return usage
 
 
+def _get_provider() -> DSPyProvider:
+    """Return the process-wide DSPyProvider, creating it on first use"""
+    global _PROVIDER_SINGLETON
+    
+    if _PROVIDER_SINGLETON is None:
+        with _PROVIDER_LOCK:
+            if _PROVIDER_SINGLETON is None:
+                _PROVIDER_SINGLETON = DSPyProvider()
+    return _PROVIDER_SINGLETON
+
+
+def _build_kwargs(prompt: str, context: Dict[str, Any]) -> Dict[str, Any]:
+    """Build DSPy module inputs from the prompt and test variables"""
+    # Prepare inputs
+    vars = context.get("vars", {})
+    
+    # Handle different input formats
+    if _TEMPLATE_MARKER in prompt:
+        # Prompt has template variables, use them
+        return dict(vars)
+    # Use prompt as question by default, plus any additional vars
+    return {"question": prompt, **vars}
+
+
+def _build_response(provider: DSPyProvider, result: Any, config: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a DSPy result into a Promptfoo response"""
+    # Extract output
+    output = provider._extract_output(result, config)
+    
+    # Build response
+    response = {
+        "output": output
+    }
+    
+    # Add usage stats if available, unless the provider config opts out
+    if config.get("track_usage", True) and (usage := provider._get_usage_stats(result)):
+        response["tokenUsage"] = usage
+    
+    # Add metadata
+    response["metadata"] = {
+        "module_type": config.get("module_type", "predict"),
+        "signature": config.get("signature", "question -> answer"),
+        "optimized": config.get("optimize", False),
+        "timestamp": _now_iso()
+    }
+    
+    # Add full result for debugging if requested
+    if config.get("debug", False):
+        # Predictions serialize via toDict(); other results via their attributes
+        as_dict = getattr(result, "toDict", None)
+        fields = as_dict() if callable(as_dict) else getattr(result, "__dict__", result)
+        try:
+            full_result = _dumps(fields)
+        except (TypeError, ValueError):
+            # Circular or otherwise unserializable results: never fail the call
+            full_result = str(result)
+        response["debug"] = {
+            "full_result": full_result,
+            "type": type(result).__name__
+        }
+    
+    return response
+
+
+def _error_response(e: Exception) -> Dict[str, Any]:
+    """Promptfoo response for a failed provider call"""
+    return {
+        "error": f"DSPy Provider Error: {str(e)}",
+        "output": ""  # Provide empty output on error
+    }
+
+
+def _rate_limit_remaining() -> float:
+    """Seconds left in the current LM rate-limit cooldown, if any"""
+    return _RATE_LIMIT_UNTIL - time.time()
+
+
+def _rate_limited_response(remaining: float) -> Dict[str, Any]:
+    """Promptfoo response for a call skipped during a rate-limit cooldown"""
+    return {
+        "error": f"DSPy Provider Error: rate limited by the LM backend, retry in {remaining:.0f}s",
+        "output": ""
+    }
+
+
+def _backoff_delay(e: RateLimitError, attempt: int) -> float:
+    """Wait time after a 429, honoring Retry-After when the LM sends it"""
+    global _RATE_LIMIT_UNTIL
+    
+    headers = getattr(getattr(e, "response", None), "headers", None) or {}
+    try:
+        delay = float(headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        delay = 2 ** attempt + random.random()
+    delay = max(0.0, min(delay, _MAX_BACKOFF))
+    
+    # Start (or extend) the shared cooldown window
+    with _RATE_LIMIT_LOCK:
+        _RATE_LIMIT_UNTIL = max(_RATE_LIMIT_UNTIL, time.time() + delay)
+    return delay
+
+
+def _retry_delay(e: Exception, attempt: int) -> Optional[float]:
+    """Wait time before retrying a failed LM call, or None if it isn't retryable"""
+    if isinstance(e, RateLimitError):
+        return _backoff_delay(e, attempt)
+    # Connection resets, timeouts (APITimeoutError) and 5xx responses are
+    # transient but don't mean we're being throttled, so no cooldown
+    if isinstance(e, APIConnectionError) or (
+            isinstance(e, APIStatusError) and (getattr(e, "status_code", 0) or 0) >= 500):
+        return min(2 ** attempt + random.random(), _MAX_BACKOFF)
+    return None
+
+
+def _call_with_backoff(module: dspy.Module, kwargs: Dict[str, Any]) -> Any:
+    """Call a DSPy module, retrying 429s and transient LM errors with backoff"""
+    for attempt in range(_LM_RETRIES + 1):
+        try:
+            return module(**kwargs)
+        except (APIConnectionError, APIStatusError) as e:
+            delay = _retry_delay(e, attempt)
+            if delay is None or attempt == _LM_RETRIES:
+                raise
+            time.sleep(delay)
+
+
+async def _await_future(future: concurrent.futures.Future) -> Any:
+    """Await a concurrent.futures.Future from the running event loop"""
+    return await asyncio.wrap_future(future)
+
+
+def _supports_async(module: dspy.Module) -> bool:
+    """Whether a module implements aforward, which Module.acall awaits"""
+    # acall is defined on dspy.Module itself, so only aforward tells us
+    # whether the concrete module (e.g. not ProgramOfThought) can run async
+    return callable(getattr(type(module), "aforward", None))
+
+
+async def _acall(module: dspy.Module, kwargs: Dict[str, Any]) -> Any:
+    """Await a single async DSPy module call, with the same retry backoff"""
+    for attempt in range(_LM_RETRIES + 1):
+        try:
+            return await module.acall(**kwargs)
+        except (APIConnectionError, APIStatusError) as e:
+            delay = _retry_delay(e, attempt)
+            if delay is None or attempt == _LM_RETRIES:
+                raise
+            await asyncio.sleep(delay)
+
+
+async def _gather_calls(
+    module: dspy.Module,
+    kwargs_list: List[Dict[str, Any]],
+    max_concurrency: int
+) -> List[Any]:
+    """Run module calls concurrently, returning exceptions in place of results"""
+    # Bound in-flight LM requests the same way the thread fallback does
+    semaphore = asyncio.Semaphore(max_concurrency)
+    
+    async def bounded(kwargs: Dict[str, Any]) -> Any:
+        async with semaphore:
+            return await _acall(module, kwargs)
+    
+    return await asyncio.gather(
+        *[bounded(kwargs) for kwargs in kwargs_list],
+        return_exceptions=True
+    )
+
+
 def call_api(prompt: str, options: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
     """
     Main entry point for Promptfoo provider
@@ -159,9 +505,14 @@ def call_api(prompt: str, options: Dict[str, Any], context: Dict[str, Any]) -> D
     Returns:
         Dictionary with output and optional metadata
     """
+    # Fail fast while the LM backend has us rate limited
+    remaining = _rate_limit_remaining()
+    if remaining > 0:
+        return _rate_limited_response(remaining)
+    
     try:
-        # Initialize provider
-        provider = DSPyProvider()
+        # Reuse the shared provider so compiled modules persist across calls
+        provider = _get_provider()
         
         # Get configuration
         config = options.get("config", {})
@@ -169,61 +520,75 @@ def call_api(prompt: str, options: Dict[str, Any], context: Dict[str, Any]) -> D
         # Get or create DSPy module
         module = provider._get_or_create_module(config)
         
-        # Prepare inputs
-        vars = context.get("vars", {})
-        
-        # Build kwargs for module call
-        kwargs = {}
-        
-        # Handle different input formats
-        if "{{" in prompt:
-            # Prompt has template variables, use them
-            for key, value in vars.items():
-                kwargs[key] = value
-        else:
-            # Use prompt as question by default
-            kwargs["question"] = prompt
-            # Add any additional vars
-            kwargs.update(vars)
-        
         # Call the DSPy module
-        result = module(**kwargs)
+        result = _call_with_backoff(module, _build_kwargs(prompt, context))
         
-        # Extract output
-        output = provider._extract_output(result, config)
+        return _build_response(provider, result, config)
         
-        # Build response
-        response = {
-            "output": output
-        }
-        
-        # Add usage stats if available
-        usage = provider._get_usage_stats(result)
-        if usage:
-            response["tokenUsage"] = usage
-        
-        # Add metadata
-        response["metadata"] = {
-            "module_type": config.get("module_type", "predict"),
-            "signature": config.get("signature", "question -> answer"),
-            "optimized": config.get("optimize", False),
-            "timestamp": datetime.now().isoformat()
-        }
-        
-        # Add full result for debugging if requested
-        if config.get("debug", False):
-            response["debug"] = {
-                "full_result": str(result),
-                "type": type(result).__name__
-            }
+    except Exception as e:
+        return _error_response(e)
+
+
+def call_api_batch(
+    prompts: List[str],
+    options: Dict[str, Any],
+    context: Union[Dict[str, Any], List[Dict[str, Any]]]
+) -> List[Dict[str, Any]]:
+    """
+    Batch entry point that evaluates several prompts concurrently
+    
+    Args:
+        prompts: The prompt texts
+        options: Provider configuration from promptfooconfig.yaml
+        context: A context shared by every prompt, or one context per prompt
+    
+    Returns:
+        List of responses in the same order as prompts, shaped like call_api's
+    """
+    remaining = _rate_limit_remaining()
+    if remaining > 0:
+        return [_rate_limited_response(remaining) for _ in prompts]
+    
+    try:
+        provider = _get_provider()
+        config = options.get("config", {})
+        module = provider._get_or_create_module(config)
         
-        return response
+        contexts = context if isinstance(context, list) else [context] * len(prompts)
+        if len(contexts) != len(prompts):
+            raise ValueError("context list must match the number of prompts")
+        kwargs_list = [_build_kwargs(p, c) for p, c in zip(prompts, contexts)]
         
+        max_workers = config.get("concurrency", 8)
+        if isinstance(max_workers, bool) or not isinstance(max_workers, int) or max_workers < 1:
+            raise ValueError(f"concurrency must be a positive integer, got {max_workers!r}")
     except Exception as e:
-        return {
-            "error": f"DSPy Provider Error: {str(e)}",
-            "output": ""  # Provide empty output on error
-        }
+        return [_error_response(e) for _ in prompts]
+    
+    if _supports_async(module):
+        # Async DSPy modules share one event loop and LM connection pool
+        results = provider._run_async(_gather_calls(module, kwargs_list, max_workers))
+    else:
+        # Modules without an async implementation fan out over threads instead
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = [pool.submit(_call_with_backoff, module, kwargs) for kwargs in kwargs_list]
+            results = []
+            for future in futures:
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    results.append(e)
+    
+    responses = []
+    for result in results:
+        if isinstance(result, BaseException):
+            responses.append(_error_response(result))
+            continue
+        try:
+            responses.append(_build_response(provider, result, config))
+        except Exception as e:
+            responses.append(_error_response(e))
+    return responses
 
 
 # Example usage for testing
@@ -240,4 +605,4 @@ if __name__ == "__main__":
     test_context = {"vars": {}}
     
     result = call_api(test_prompt, test_options, test_context)
-    print(json.dumps(result, indent=2))
+    print(_dumps(result, pretty=True))